@@ -2,21 +2,30 @@
 LegisWatch - A web application to track U.S. legislation
 Built with Flask, Bootstrap, and Congress.gov API
 """
-from dotenv import load_dotenv
-# Load environment variables from .env file
-load_dotenv()
-# Remaining imports
 import os
-import json
-import csv
-import io
+# Load environment variables from the .env file next to this module (only imports dotenv when there is one)
+_ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(_ENV_PATH):
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_PATH)
+# Remaining imports
+import functools
+import hashlib
+import orjson
 import requests
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, make_response
-from werkzeug.exceptions import RequestTimeout
+import sqlite3
+import threading
+import time
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from flask_compress import Compress
 import logging
 import re
-from urllib.parse import urlencode
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +33,7 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
+Compress(app)  # Gzip responses for clients that send Accept-Encoding: gzip
 
 # API Configuration - Using Congress.gov API (no key required)
 CONGRESS_API_BASE_URL = 'https://api.congress.gov/v3'
@@ -32,6 +42,86 @@ CONGRESS_API_KEY = os.environ.get('CONGRESS_API_KEY')  # Optional, but recommend
 # HuggingFace API for LLM summaries (optional)
 HUGGINGFACE_API_KEY = os.environ.get('HUGGINGFACE_API_KEY')
 HUGGINGFACE_API_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
+LLM_CACHE_DB = os.environ.get('LLM_CACHE_DB')  # Optional SQLite file so AI summaries survive restarts
+
+# Cache lifetimes (seconds) for Congress.gov responses
+BILL_CACHE_TTL = 15 * 60  # Bill lists and details
+MEMBER_CACHE_TTL = 6 * 60 * 60  # Chamber rosters only change on swearing-in
+LLM_CACHE_TTL = 24 * 60 * 60  # AI summaries of unchanged bill text
+
+# Bills per HuggingFace request, small enough for one request to finish within its timeout
+LLM_BATCH_SIZE = 4
+
+# Seconds to wait for a Congress.gov connection, kept short because failed connects are retried
+CONNECT_TIMEOUT = 3
+
+# Shared HTTP session for HuggingFace calls (keeps the TLS connection alive between summaries)
+_HF_SESSION = requests.Session()
+
+# Process-wide worker pool for I/O-bound Congress.gov fanout (must not exceed the adapter pool size)
+_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+# Full state and delegate territory names to USPS abbreviations, used to normalize state searches
+_STATE_NAME_TO_ABBR = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
+    'california': 'CA', 'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID',
+    'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
+    'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
+    'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS',
+    'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV',
+    'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY',
+    'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
+    'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
+    'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
+    'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV',
+    'wisconsin': 'WI', 'wyoming': 'WY',
+    'district of columbia': 'DC', 'puerto rico': 'PR', 'guam': 'GU', 'american samoa': 'AS',
+    'virgin islands': 'VI', 'northern mariana islands': 'MP'
+}
+_STATE_ABBRS = frozenset(_STATE_NAME_TO_ABBR.values())
+
+# Bill fields that may hold a summary, in order of preference
+_SUMMARY_FIELDS = ('summary', 'latestSummary', 'summary_short', 'description')
+
+# Dates the API already returns in display format
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# CSV export columns as (header, bill key) pairs
+_EXPORT_FIELDS = (
+    ('Bill ID', 'id'),
+    ('Title', 'title'),
+    ('Summary', 'summary'),
+    ('Introduced Date', 'introduced_date'),
+    ('Sponsor', 'sponsor'),
+    ('Type', 'bill_type'),
+    ('Congress URL', 'congress_url'),
+)
+_EXPORT_HEADER = ','.join(header for header, _ in _EXPORT_FIELDS) + '\r\n'
+_CSV_QUOTE_TABLE = str.maketrans({'"': '""'})
+_CSV_SPECIAL_CHARS = (',', '"', '\n', '\r')
+
+# Bill types mapped to their Congress.gov URL segment
+_BILL_TYPE_URL = {
+    'HR': 'house-bill',
+    'S': 'senate-bill',
+    'HJRES': 'house-joint-resolution',
+    'SJRES': 'senate-joint-resolution',
+    'HCONRES': 'house-concurrent-resolution',
+    'SCONRES': 'senate-concurrent-resolution',
+    'HRES': 'house-resolution',
+    'SRES': 'senate-resolution'
+}
+
+_URL_TEMPLATE = 'https://www.congress.gov/bill/{}th-congress/{}/{}'.format
+
+@functools.lru_cache(maxsize=4096)
+def _congress_url(congress, bill_type, bill_number):
+    """Generate proper Congress.gov URL for a bill (bill_type must already be upper-case)"""
+    if not bill_type or not bill_number:
+        return 'https://www.congress.gov'
+    
+    return _URL_TEMPLATE(congress, _BILL_TYPE_URL.get(bill_type, 'bill'), bill_number)
 
 class BillTracker:
     """Main class to handle bill tracking functionality using Congress.gov API"""
@@ -42,8 +132,26 @@ class BillTracker:
             'X-API-Key': self.api_key        } if self.api_key else {}
         # Current Congress session (118th Congress: 2023-2025)
         self.current_congress = 118
+        
+        # Pooled session so repeat calls to api.congress.gov reuse kept-alive connections
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            # Read timeouts are not retried, and the last 5xx response is returned for _cached_get to check
+            max_retries=Retry(total=3, connect=3, read=0, status=3, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504], raise_on_status=False)
+        ))
+        self.session.headers.update(self.headers)
+        
+        # In-memory TTL caches for Congress.gov GETs, keyed on (url, params)
+        self._bill_cache = TTLCache(maxsize=2048, ttl=BILL_CACHE_TTL)
+        # One entry per state and chamber, plus the two full rosters
+        self._member_cache = TTLCache(maxsize=256, ttl=MEMBER_CACHE_TTL)
+        self._cache_lock = threading.RLock()
+        self._cache_stats = {'hits': 0, 'misses': 0}
     
-    def search_bills_by_keyword(self, keyword, limit=20):
+    def search_bills_by_keyword(self, keyword, limit=20, refresh=False):
         """Search for bills by keyword using Congress.gov API"""
         try:
             if not self.api_key:
@@ -52,29 +160,27 @@ class BillTracker:
             
             # Congress.gov API endpoint for bill search
             url = f"{CONGRESS_API_BASE_URL}/bill/{self.current_congress}"
+            # The bill list endpoint has no keyword filter, so scan the largest page it serves.
+            # Leaving the keyword out of the params lets every search share one cached page.
             params = {
                 'format': 'json',
-                'limit': min(limit, 100),  # API limit
+                'limit': 250,  # API maximum
                 'sort': 'updateDate+desc'
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._cached_get(url, params, timeout=10, refresh=refresh)
+            if data is None:
+                return self._get_mock_bills(keyword)
             bills = data.get('bills', [])
             
-            # Filter bills by keyword in title or summary
-            filtered_bills = self._filter_bills_by_keyword(bills, keyword)
+            # Keep only bills matching the keyword, title matches first
+            ranked_bills = self._rank_bills_by_keyword(bills, keyword)
             
-            # Get detailed information for the filtered bills
-            detailed_bills = []
-            for bill in filtered_bills[:limit]:
-                detailed_bill = self._get_bill_details(bill)
-                if detailed_bill:
-                    detailed_bills.append(detailed_bill)
+            # Get detailed information for the matched bills concurrently
+            get_details = partial(self._get_bill_details, refresh=refresh)
+            detailed_bills = _EXECUTOR.map(get_details, ranked_bills[:limit])
             
-            return detailed_bills
+            return [bill for bill in detailed_bills if bill]
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Congress API request failed: {e}")
@@ -83,7 +189,7 @@ class BillTracker:
             logger.error(f"Unexpected error: {e}")
             return self._get_mock_bills(keyword)
     
-    def search_bills_by_state(self, state, limit=20):
+    def search_bills_by_state(self, state, limit=20, refresh=False):
         """Search for bills by sponsor's state using Congress.gov API"""
         try:
             logger.info(f"Searching for bills from state: {state}")
@@ -93,16 +199,17 @@ class BillTracker:
                 return self._get_mock_bills_by_state(state)
             
             # Get current Congress members from the state
-            members = self._get_members_by_state(state)
+            members = self._get_members_by_state(state, refresh=refresh)
             
             if not members:
                 logger.warning(f"No members found for state: {state}, using mock data")
                 return self._get_mock_bills_by_state(state)
             
-            # Get bills sponsored by these members
+            # Get bills sponsored by these members concurrently
+            bioguide_ids = [member.get('bioguideId', '') for member in members[:10]]  # Limit to avoid too many API calls
             all_bills = []
-            for member in members[:10]:  # Limit to avoid too many API calls
-                member_bills = self._get_member_sponsored_bills(member.get('bioguideId', ''))
+            get_sponsored = partial(self._get_member_sponsored_bills, refresh=refresh)
+            for member_bills in _EXECUTOR.map(get_sponsored, bioguide_ids):
                 all_bills.extend(member_bills)
             
             # Sort by update date and limit
@@ -113,19 +220,52 @@ class BillTracker:
             logger.error(f"Error searching bills by state: {e}")
             return self._get_mock_bills_by_state(state)
     
-    def _filter_bills_by_keyword(self, bills, keyword):
-        """Filter bills by keyword in title"""
-        keyword_lower = keyword.lower()
-        filtered = []
+    def _cached_get(self, url, params, cache=None, timeout=10, refresh=False):
+        """GET a Congress.gov endpoint as JSON via the TTL cache, or None on a non-200 response (timeout is the read timeout)"""
+        cache = self._bill_cache if cache is None else cache
+        key = (url, tuple(sorted(params.items())))
+        
+        with self._cache_lock:
+            data = None if refresh else cache.get(key)
+            self._cache_stats['hits' if data is not None else 'misses'] += 1
+        if data is not None:
+            return data
+        
+        response = self.session.get(url, params=params, timeout=(CONNECT_TIMEOUT, timeout))
+        if response.status_code != 200:
+            logger.warning(f"Congress API returned {response.status_code} for {url}")
+            return None
+        data = self._json(response)
         
+        with self._cache_lock:
+            cache[key] = data
+        return data
+    
+    def _json(self, response):
+        """Parse a JSON response body with orjson"""
+        return orjson.loads(response.content)
+    
+    def _rank_bills_by_keyword(self, bills, keyword):
+        """Keep bills matching the keyword in title or summary, with title matches first"""
+        title_matches = self._filter_bills_by_keyword(bills, keyword)
+        matched_ids = {id(bill) for bill in title_matches}
+        keyword_folded = keyword.casefold()
+        summary_matches = []
         for bill in bills:
-            title = bill.get('title', '').lower()
-            if keyword_lower in title:
-                filtered.append(bill)
-        
-        return filtered
+            if id(bill) in matched_ids:
+                continue
+            summary = self._get_bill_summary(bill)
+            if summary != 'No summary available' and keyword_folded in summary.casefold():
+                summary_matches.append(bill)
+        return title_matches + summary_matches
+    
+    def _filter_bills_by_keyword(self, bills, keyword):
+        """Filter bills by keyword in title"""
+        # Titles are casefolded per call; one page of bills is too small for a cached column to pay off
+        keyword_folded = keyword.casefold()
+        return [bill for bill in bills if keyword_folded in (bill.get('title') or '').casefold()]
     
-    def _get_bill_details(self, bill):
+    def _get_bill_details(self, bill, refresh=False):
         """Get detailed information for a specific bill"""
         try:
             bill_number = bill.get('number')
@@ -138,20 +278,18 @@ class BillTracker:
             detail_url = f"{CONGRESS_API_BASE_URL}/bill/{self.current_congress}/{bill_type}/{bill_number}"
             params = {'format': 'json'}
             
-            response = requests.get(detail_url, headers=self.headers, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                detail_data = response.json()
-                bill_detail = detail_data.get('bill', {})
-                return self._format_detailed_bill(bill_detail)
-            else:
+            detail_data = self._cached_get(detail_url, params, timeout=5, refresh=refresh)
+            if detail_data is None:
                 return self._format_basic_bill(bill)
-                
+            
+            bill_detail = detail_data.get('bill', {})
+            return self._format_detailed_bill(bill_detail)
+            
         except Exception as e:
             logger.error(f"Error getting bill details: {e}")
             return self._format_basic_bill(bill)
     
-    def _get_members_by_state(self, state):
+    def _get_members_by_state(self, state, refresh=False):
         """Get current Congress members from a specific state"""
         try:
             # Normalize state input
@@ -159,35 +297,53 @@ class BillTracker:
             if not state_abbr:
                 return []
             
-            members = []
-            
-            # Get House members
-            house_url = f"{CONGRESS_API_BASE_URL}/member/house/{self.current_congress}"
-            params = {'format': 'json', 'limit': 250}
-            
-            response = requests.get(house_url, headers=self.headers, params=params, timeout=10)
-            if response.status_code == 200:
-                house_data = response.json()
-                house_members = [m for m in house_data.get('members', []) 
-                               if m.get('state', '').upper() == state_abbr.upper()]
-                members.extend(house_members)
+            # Get House and Senate members in parallel
+            futures = {
+                _EXECUTOR.submit(self._get_chamber_members, chamber, state_abbr, refresh): chamber
+                for chamber in ('house', 'senate')
+            }
             
-            # Get Senate members
-            senate_url = f"{CONGRESS_API_BASE_URL}/member/senate/{self.current_congress}"
-            response = requests.get(senate_url, headers=self.headers, params=params, timeout=10)
-            if response.status_code == 200:
-                senate_data = response.json()
-                senate_members = [m for m in senate_data.get('members', []) 
-                                if m.get('state', '').upper() == state_abbr.upper()]
-                members.extend(senate_members)
+            chamber_members = {}
+            for future in as_completed(futures):
+                chamber_members[futures[future]] = future.result()
             
-            return members
+            # Keep House members ahead of Senate members regardless of completion order
+            return chamber_members.get('house', []) + chamber_members.get('senate', [])
             
         except Exception as e:
             logger.error(f"Error getting members by state: {e}")
             return []
     
-    def _get_member_sponsored_bills(self, bioguide_id):
+    def _get_chamber_members(self, chamber, state_abbr, refresh=False):
+        """Get one chamber's members from a state, letting the API filter by state when it can"""
+        url = f"{CONGRESS_API_BASE_URL}/member/{chamber}/{self.current_congress}"
+        params = {
+            'format': 'json',
+            'limit': 60,
+            'stateCode': state_abbr.upper(),
+            'currentMember': 'true'
+        }
+        
+        data = self._cached_get(url, params, cache=self._member_cache, timeout=10, refresh=refresh)
+        if data is not None:
+            members = data.get('members', [])
+            # A member whose state maps to a different code means the API ignored the filter
+            if not any(self._normalize_state(m.get('state') or '') not in (state_abbr, None) for m in members):
+                return members
+        
+        # Server-side filter rejected or ignored, fall back to the full roster
+        logger.info(f"stateCode filter not applied for {chamber} members, fetching full roster")
+        params = {'format': 'json', 'limit': 250}
+        data = self._cached_get(url, params, cache=self._member_cache, timeout=10, refresh=refresh)
+        if data is None:
+            return []
+        return self._filter_members_by_state(data.get('members', []), state_abbr)
+    
+    def _filter_members_by_state(self, members, state_abbr):
+        """Keep members from a state (member records carry the full state name)"""
+        return [m for m in members if self._normalize_state(m.get('state') or '') == state_abbr]
+    
+    def _get_member_sponsored_bills(self, bioguide_id, refresh=False):
         """Get bills sponsored by a specific member"""
         try:
             if not bioguide_id:
@@ -200,19 +356,18 @@ class BillTracker:
                 'sort': 'updateDate+desc'
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=5)
+            data = self._cached_get(url, params, timeout=5, refresh=refresh)
+            if data is None:
+                return []
+            bills = data.get('sponsoredLegislation', [])
+            formatted_bills = []
             
-            if response.status_code == 200:
-                data = response.json()
-                bills = data.get('sponsoredLegislation', [])
-                formatted_bills = []
-                
-                for bill in bills:
-                    formatted_bill = self._format_basic_bill(bill)
-                    if formatted_bill:
-                        formatted_bills.append(formatted_bill)
-                
-                return formatted_bills
+            for bill in bills:
+                formatted_bill = self._format_basic_bill(bill)
+                if formatted_bill:
+                    formatted_bills.append(formatted_bill)
+            
+            return formatted_bills
             
         except Exception as e:
             logger.error(f"Error getting member sponsored bills: {e}")
@@ -226,7 +381,7 @@ class BillTracker:
             bill_number = bill.get('number', 'N/A')
             
             # Generate proper Congress.gov URL
-            congress_url = self._generate_congress_url(bill_type, bill_number)
+            congress_url = _congress_url(self.current_congress, bill_type, bill_number)
             
             formatted_bill = {
                 'id': f"{bill_type}{bill_number}",
@@ -251,7 +406,7 @@ class BillTracker:
             bill_number = bill.get('number', 'N/A')
             
             # Generate proper Congress.gov URL
-            congress_url = self._generate_congress_url(bill_type, bill_number)
+            congress_url = _congress_url(self.current_congress, bill_type, bill_number)
             
             # Get the best available summary
             summary = self._get_bill_summary(bill)
@@ -277,35 +432,13 @@ class BillTracker:
             logger.error(f"Error formatting detailed bill: {e}")
             return None
     
-    def _generate_congress_url(self, bill_type, bill_number):
-        """Generate proper Congress.gov URL for a bill"""
-        if not bill_type or not bill_number:
-            return 'https://www.congress.gov'
-        
-        # Convert bill type to Congress.gov format
-        type_mapping = {
-            'HR': 'house-bill',
-            'S': 'senate-bill',
-            'HJRES': 'house-joint-resolution',
-            'SJRES': 'senate-joint-resolution',
-            'HCONRES': 'house-concurrent-resolution',
-            'SCONRES': 'senate-concurrent-resolution',
-            'HRES': 'house-resolution',
-            'SRES': 'senate-resolution'
-        }
-        
-        url_type = type_mapping.get(bill_type.upper(), 'bill')
-        return f"https://www.congress.gov/bill/{self.current_congress}th-congress/{url_type}/{bill_number}"
-    
     def _get_bill_summary(self, bill):
         """Extract bill summary from various possible fields"""
         # Try multiple fields where summary might be stored
-        summary_fields = ['summary', 'latestSummary', 'summary_short', 'description']
-        
-        for field in summary_fields:
+        for field in _SUMMARY_FIELDS:
             summary = bill.get(field)
-            if summary and isinstance(summary, str) and len(summary.strip()) > 0:
-                return summary.strip()
+            if isinstance(summary, str) and (stripped := summary.strip()):
+                return stripped
         
         return 'No summary available'
     
@@ -326,11 +459,17 @@ class BillTracker:
         
         return "Unknown"
     
-    def _format_date(self, date_string):
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _format_date(date_string):
         """Format date string for display"""
         if not date_string:
             return 'Unknown'
         
+        # Already in display format
+        if _ISO_DATE_RE.match(date_string):
+            return date_string
+        
         try:
             # Handle different date formats
             if 'T' in date_string:
@@ -339,35 +478,39 @@ class BillTracker:
                 date_obj = datetime.strptime(date_string, '%Y-%m-%d')
             
             return date_obj.strftime('%Y-%m-%d')
-        except:
+        except ValueError:
             return date_string
     
-    def _normalize_state(self, state_input):
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _normalize_state(state_input):
         """Normalize state input to standard abbreviation"""
-        state_mapping = {
-            'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
-            'california': 'CA', 'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE',
-            'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID',
-            'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
-            'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
-            'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS',
-            'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV',
-            'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY',
-            'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
-            'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
-            'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
-            'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV',
-            'wisconsin': 'WI', 'wyoming': 'WY'
-        }
-        
-        state_lower = state_input.lower().strip()
+        state = state_input.strip()
+        state_upper = state.upper()
         
         # If it's already an abbreviation
-        if len(state_input) == 2 and state_input.upper() in state_mapping.values():
-            return state_input.upper()
+        if len(state) == 2 and state_upper in _STATE_ABBRS:
+            return state_upper
         
         # If it's a full state name
-        return state_mapping.get(state_lower, state_input.upper() if len(state_input) == 2 else None)
+        return _STATE_NAME_TO_ABBR.get(state.lower(), state_upper if len(state) == 2 else None)
+    
+    def _build_mock_bill(self, bill):
+        """Format a mock bill record for frontend display"""
+        bill_type = bill['type']
+        bill_number = bill['number']
+        introduced_date = bill['introducedDate']
+        return {
+            'id': f"{bill_type}{bill_number}",
+            'title': bill['title'],
+            'summary': bill['summary'],
+            'introduced_date': introduced_date,
+            'sponsor': bill['sponsor'],
+            'congress_url': _congress_url(self.current_congress, bill_type, bill_number),
+            'bill_type': bill_type,
+            'number': bill_number,
+            'updateDate': introduced_date
+        }
     
     def _get_mock_bills(self, keyword):
         """Return enhanced mock bill data with realistic Congress.gov URLs"""
@@ -462,11 +605,11 @@ class BillTracker:
         ]
         
         # Get relevant bills based on keyword
-        keyword_lower = keyword.lower()
+        keyword_folded = keyword.casefold()
         relevant_bills = []
         
         for topic, bills in mock_bills_db.items():
-            if topic in keyword_lower or keyword_lower in topic:
+            if topic in keyword_folded or keyword_folded in topic:
                 relevant_bills.extend(bills)
         
         # If no specific match, use default bills
@@ -474,21 +617,7 @@ class BillTracker:
             relevant_bills = default_bills
         
         # Format bills for frontend
-        formatted_bills = []
-        for bill in relevant_bills:
-            formatted_bill = {
-                'id': f"{bill['type']}{bill['number']}",
-                'title': bill['title'],
-                'summary': bill['summary'],
-                'introduced_date': bill['introducedDate'],
-                'sponsor': bill['sponsor'],
-                'congress_url': self._generate_congress_url(bill['type'], bill['number']),                'bill_type': bill['type'],
-                'number': bill['number'],
-                'updateDate': bill['introducedDate']
-            }
-            formatted_bills.append(formatted_bill)
-        
-        return formatted_bills
+        return list(map(self._build_mock_bill, relevant_bills))
     
     def _get_mock_bills_by_state(self, state):
         """Return enhanced mock bill data by state with realistic Congress.gov URLs"""
@@ -589,20 +718,7 @@ class BillTracker:
             ]
         
         # Format bills for frontend
-        formatted_bills = []
-        for bill in state_bills:
-            formatted_bill = {
-                'id': f"{bill['type']}{bill['number']}",
-                'title': bill['title'],
-                'summary': bill['summary'],
-                'introduced_date': bill['introducedDate'],
-                'sponsor': bill['sponsor'],
-                'congress_url': self._generate_congress_url(bill['type'], bill['number']),
-                'bill_type': bill['type'],
-                'number': bill['number'],
-                'updateDate': bill['introducedDate']
-            }
-            formatted_bills.append(formatted_bill)
+        formatted_bills = list(map(self._build_mock_bill, state_bills))
         
         logger.info(f"Generated {len(formatted_bills)} mock bills for {state}")
         return formatted_bills
@@ -611,26 +727,123 @@ class BillTracker:
 bill_tracker = BillTracker()
 
 # LLM Summary functionality
+def _open_llm_cache_db(path):
+    """Open the SQLite store backing the AI summary cache"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS llm_summaries '
+        '(key BLOB PRIMARY KEY, summary TEXT NOT NULL, created REAL NOT NULL)'
+    )
+    # Expired rows are skipped on read, so drop them here to keep the file from growing
+    conn.execute('DELETE FROM llm_summaries WHERE created <= ?', (time.time() - LLM_CACHE_TTL,))
+    conn.commit()
+    return conn
+
+# AI summary cache keyed on a hash of the topic and the bill text sent to the model
+_LLM_CACHE = TTLCache(maxsize=4096, ttl=LLM_CACHE_TTL)
+_LLM_CACHE_LOCK = threading.Lock()
+_LLM_CACHE_CONN = _open_llm_cache_db(LLM_CACHE_DB) if LLM_CACHE_DB else None
+
+def _llm_cache_key(bill_text, topic):
+    """Hash the prompt inputs that determine an AI summary"""
+    return hashlib.blake2b(f"{topic}|{bill_text[:1000]}".encode(), digest_size=16).digest()
+
+def _get_cached_llm_summary(key):
+    """Look up an AI summary in memory, then in the SQLite store if configured"""
+    with _LLM_CACHE_LOCK:
+        summary = _LLM_CACHE.get(key)
+        if summary is None and _LLM_CACHE_CONN is not None:
+            try:
+                row = _LLM_CACHE_CONN.execute(
+                    'SELECT summary FROM llm_summaries WHERE key = ? AND created > ?',
+                    (key, time.time() - LLM_CACHE_TTL)
+                ).fetchone()
+            except sqlite3.Error as e:
+                # Treat an unreadable store (e.g. locked by another worker) as a cache miss
+                logger.warning(f"AI summary cache lookup failed: {e}")
+                row = None
+            if row:
+                summary = _LLM_CACHE[key] = row[0]
+        return summary
+
+def _store_llm_summary(key, summary):
+    """Save an AI summary to memory and to the SQLite store if configured"""
+    with _LLM_CACHE_LOCK:
+        _LLM_CACHE[key] = summary
+        if _LLM_CACHE_CONN is not None:
+            try:
+                _LLM_CACHE_CONN.execute(
+                    'INSERT OR REPLACE INTO llm_summaries (key, summary, created) VALUES (?, ?, ?)',
+                    (key, summary, time.time())
+                )
+                _LLM_CACHE_CONN.commit()
+            except sqlite3.Error as e:
+                # Keep the in-memory copy and skip the persistent write
+                logger.warning(f"AI summary cache write failed: {e}")
+
 def get_llm_summary(bill_text, topic="general"):
     """Get AI summary of bill using HuggingFace API"""
-    try:
-        if not HUGGINGFACE_API_KEY:
-            logger.warning("HuggingFace API key not provided. Skipping AI summary.")
-            return f"AI Summary not available (API key required). This bill relates to {topic}."
-        
+    return get_llm_summaries_batch([bill_text], topic)[0]
+
+def get_llm_summaries_batch(bill_texts, topic="general"):
+    """Get AI summaries for several bills with a few batched HuggingFace API requests"""
+    if not HUGGINGFACE_API_KEY:
+        logger.warning("HuggingFace API key not provided. Skipping AI summary.")
+        return [f"AI Summary not available (API key required). This bill relates to {topic}."] * len(bill_texts)
+    
+    summaries = [None] * len(bill_texts)
+    cache_keys = {}
+    pending = []  # Indexes of bills that still need a summary from the API
+    for i, bill_text in enumerate(bill_texts):
         if not bill_text or bill_text.strip() == 'No summary available':
             logger.warning(f"No bill text provided for AI summary. Topic: {topic}")
-            return f"Cannot generate AI summary - no bill text available. This bill relates to {topic}."
-        
-        logger.info(f"Generating AI summary for topic: {topic}")
+            summaries[i] = f"Cannot generate AI summary - no bill text available. This bill relates to {topic}."
+            continue
         
+        cache_keys[i] = _llm_cache_key(bill_text, topic)
+        summaries[i] = _get_cached_llm_summary(cache_keys[i])
+        if summaries[i] is None:
+            pending.append(i)
+    
+    if not pending:
+        return summaries
+    
+    logger.info(f"Generating {len(pending)} AI summaries for topic: {topic}")
+    
+    # Small chunks sent concurrently, so each request fits its timeout and a failure only costs its chunk
+    chunks = [pending[j:j + LLM_BATCH_SIZE] for j in range(0, len(pending), LLM_BATCH_SIZE)]
+    request_chunk = partial(_request_llm_summaries, topic=topic)
+    chunk_texts = [[bill_texts[i] for i in chunk] for chunk in chunks]
+    for chunk, (results, fallback) in zip(chunks, _EXECUTOR.map(request_chunk, chunk_texts)):
+        if results is None:
+            for i in chunk:
+                summaries[i] = fallback
+            continue
+        for i, summary_text in zip(chunk, results):
+            summaries[i] = summary_text or "Summary not available"
+            if summary_text:
+                _store_llm_summary(cache_keys[i], summary_text)
+    
+    return summaries
+
+def _request_llm_summaries(bill_texts, topic):
+    """Request AI summaries for one chunk of bills, returning (summary texts or None, fallback summary)"""
+    # Fallback summary
+    fallback = (
+        f"This bill addresses {topic}-related policies and may impact "
+        "regulatory compliance for businesses."
+    )
+    
+    try:
         headers = {"Authorization": f"Bearer {HUGGINGFACE_API_KEY}"}
         
-        # Prepare prompt for business/compliance context
-        prompt = f"Summarize this bill for a compliance officer. Highlight what this means for businesses and {topic}: {bill_text[:1000]}"
-        
+        # Prepare prompts for business/compliance context
         payload = {
-            "inputs": prompt,
+            "inputs": [
+                f"Summarize this bill for a compliance officer. Highlight what this means for businesses and {topic}: {bill_text[:1000]}"
+                for bill_text in bill_texts
+            ],
             "parameters": {
                 "max_length": 150,
                 "min_length": 50,
@@ -638,7 +851,7 @@ def get_llm_summary(bill_text, topic="general"):
             }
         }
         
-        response = requests.post(
+        response = _HF_SESSION.post(
             HUGGINGFACE_API_URL,
             headers=headers,
             json=payload,
@@ -646,27 +859,32 @@ def get_llm_summary(bill_text, topic="general"):
         )
 
         if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list) and len(result) > 0:
-                summary = result[0].get("summary_text", "Summary not available")
-                logger.info(f"AI summary generated successfully for topic: {topic}")
-                return summary
-            else:
-                logger.warning(f"HuggingFace API returned empty result for topic: {topic}")
+            result = orjson.loads(response.content)
+            if isinstance(result, list) and len(result) == len(bill_texts):
+                logger.info(f"AI summaries generated successfully for topic: {topic}")
+                return [item.get("summary_text") for item in result], fallback
+            logger.warning(f"HuggingFace API returned an incomplete result for topic: {topic}")
         else:
             logger.error(
                 f"HuggingFace API error {response.status_code}: {response.text}"
             )
-
-        # Fallback summary
-        return (
-            f"This bill addresses {topic}-related policies and may impact "
-            "regulatory compliance for businesses."
-        )
         
     except Exception as e:
         logger.error(f"LLM summary error: {e}")
-        return f"AI summary unavailable. This bill relates to {topic} and may have regulatory implications."
+        fallback = f"AI summary unavailable. This bill relates to {topic} and may have regulatory implications."
+    
+    return None, fallback
+
+def _json_response(payload, status=200):
+    """Build a JSON response with orjson, which encodes large bill lists faster than jsonify"""
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+def _csv_escape(value):
+    """Escape a CSV field the same way csv.writer's default dialect does"""
+    value = '' if value is None else str(value)
+    if any(char in value for char in _CSV_SPECIAL_CHARS):
+        return f'"{value.translate(_CSV_QUOTE_TABLE)}"'
+    return value
 
 # Routes
 @app.route('/')
@@ -681,29 +899,34 @@ def api_search():
         data = request.get_json()
         query = data.get('query', '').strip()
         search_type = data.get('type', 'keyword')  # 'keyword' or 'state'
+        refresh = request.args.get('refresh') == '1'  # ?refresh=1 bypasses the API cache
         
         if not query:
             return jsonify({'error': 'Query parameter is required'}), 400
         
         # Search for bills
         if search_type == 'state':
-            bills = bill_tracker.search_bills_by_state(query)
+            bills = bill_tracker.search_bills_by_state(query, refresh=refresh)
         else:
-            bills = bill_tracker.search_bills_by_keyword(query)
+            bills = bill_tracker.search_bills_by_keyword(query, refresh=refresh)
         
         # Add AI summaries if requested
         include_ai = data.get('include_ai', False)
         if include_ai:
-            for bill in bills:
-                bill['ai_summary'] = get_llm_summary(bill['summary'], query)
+            ai_summaries = get_llm_summaries_batch([bill['summary'] for bill in bills], query)
+            for bill, ai_summary in zip(bills, ai_summaries):
+                bill['ai_summary'] = ai_summary
         
-        return jsonify({
+        response = _json_response({
             'success': True,
             'bills': bills,
             'count': len(bills),
             'query': query,
             'search_type': search_type
         })
+        response.headers['Cache-Control'] = 'private, max-age=60'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
         
     except Exception as e:
         logger.error(f"Search API error: {e}")
@@ -719,32 +942,19 @@ def api_export():
         if not bills:
             return jsonify({'error': 'No bills to export'}), 400
         
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
+        # Rows are formatted after the view returns, so reject malformed bills up front
+        if not isinstance(bills, list) or not all(isinstance(bill, dict) for bill in bills):
+            return jsonify({'error': 'Bills must be a list of objects'}), 400
         
-        # Write header
-        writer.writerow(['Bill ID', 'Title', 'Summary', 'Introduced Date', 'Sponsor', 'Type', 'Congress URL'])
+        # Stream CSV rows to the client as they are formatted
+        def generate_rows():
+            yield _EXPORT_HEADER
+            for bill in bills:
+                yield ','.join(_csv_escape(bill.get(key, '')) for _, key in _EXPORT_FIELDS) + '\r\n'
         
-        # Write bill data
-        for bill in bills:
-            writer.writerow([
-                bill.get('id', ''),
-                bill.get('title', ''),
-                bill.get('summary', ''),
-                bill.get('introduced_date', ''),
-                bill.get('sponsor', ''),
-                bill.get('bill_type', ''),
-                bill.get('congress_url', '')
-            ])
-        
-        # Create response
-        csv_content = output.getvalue()
-        output.close()
-        
-        response = make_response(csv_content)
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=legiswatch_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        response = Response(stream_with_context(generate_rows()), mimetype='text/csv')
+        response.headers['Cache-Control'] = 'no-store'
+        response.headers['Content-Disposition'] = f'attachment; filename=legiswatch_results_{time.strftime("%Y%m%d_%H%M%S", time.gmtime())}.csv'
         
         return response
         
@@ -755,12 +965,15 @@ def api_export():
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    response = jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'api_configured': bool(CONGRESS_API_KEY),
-        'llm_configured': bool(HUGGINGFACE_API_KEY)
+        'llm_configured': bool(HUGGINGFACE_API_KEY),
+        'cache_stats': dict(bill_tracker._cache_stats)
     })
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,73 @@
+"""
+Shared pytest fixtures for the LegisWatch test suite
+Living at the project root, this file also puts app.py on pytest's import path
+"""
+
+import orjson
+import pytest
+
+class _FakeResponse:
+    """Minimal stand-in for requests.Response"""
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.content = orjson.dumps(payload)
+        self.text = self.content.decode()
+
+@pytest.fixture(scope="session")
+def app():
+    """Flask application under test"""
+    from app import app
+    return app
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Test client shared by every route test"""
+    return app.test_client()
+
+@pytest.fixture(scope="session")
+def tracker():
+    """BillTracker built once for the whole session"""
+    from app import BillTracker
+    return BillTracker()
+
+@pytest.fixture
+def fake_congress(monkeypatch):
+    """Fresh BillTracker whose Congress.gov GETs go to a fake that records each (url, params)"""
+    from app import BillTracker
+    tracker = BillTracker()
+    def fake_get(url, params=None, timeout=None):
+        fake_get.calls.append((url, params))
+        return _FakeResponse(*fake_get.respond(url, params))
+    fake_get.calls = []
+    fake_get.respond = lambda url, params: (404, {})  # Tests set this to return (status, payload)
+
+    monkeypatch.setattr(tracker.session, 'get', fake_get)
+    return tracker
+
+@pytest.fixture
+def fake_hf(monkeypatch):
+    """Route HuggingFace calls to a fake that echoes each bill's text and records the inputs sent"""
+    import app as legiswatch
+    from cachetools import TTLCache
+    monkeypatch.setattr(legiswatch, 'HUGGINGFACE_API_KEY', 'test-key')
+    monkeypatch.setattr(legiswatch, '_LLM_CACHE', TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(legiswatch, '_LLM_CACHE_CONN', None)
+    def fake_post(url, headers=None, json=None, timeout=None):
+        fake_post.sent.append(json['inputs'])
+        # The prompt ends with the bill text, so echo it back to identify the bill
+        return _FakeResponse(200, [{'summary_text': f"AI: {prompt.rsplit(': ', 1)[1]}"}
+                                   for prompt in json['inputs'][:fake_post.result_count]])
+    fake_post.sent = []
+    fake_post.result_count = None  # Set to truncate the fake's result list
+
+    monkeypatch.setattr(legiswatch._HF_SESSION, 'post', fake_post)
+    return fake_post
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Pooled requests.Session for tests that talk to a live server"""
+    import requests
+    session = requests.Session()
+    session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    yield session
+    session.close()
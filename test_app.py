@@ -1,155 +1,249 @@
 #!/usr/bin/env python3
 """
-Test script for LegisWatch application
-Run this to verify the application is working correctly
+Test suite for LegisWatch application
+Run with pytest (add -n auto when pytest-xdist is installed) to verify the application is working correctly
 """
 
 import sys
 import os
-import requests
-import subprocess
-import time
 import threading
-from werkzeug.serving import make_server
 
-# Add the project root to Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pytest
 
 def test_imports():
     """Test that all required modules can be imported"""
-    print("Testing imports...")
-    try:
-        import flask
-        import requests
-        from app import app, BillTracker
-        print("✓ All imports successful")
-        return True
-    except ImportError as e:
-        print(f"✗ Import error: {e}")
-        return False
-
-def test_bill_tracker():
+    import flask
+    import requests
+    from app import app, BillTracker
+
+def test_bill_tracker(tracker):
     """Test the BillTracker class functionality"""
-    print("Testing BillTracker...")
-    try:
-        from app import BillTracker
-        tracker = BillTracker()
-        
-        # Test keyword search
-        bills = tracker.search_bills_by_keyword("healthcare", limit=5)
-        assert isinstance(bills, list), "search_bills_by_keyword should return a list"
-        print(f"✓ Keyword search returned {len(bills)} bills")
-        
-        # Test state search
-        bills = tracker.search_bills_by_state("CA", limit=5)
-        assert isinstance(bills, list), "search_bills_by_state should return a list"
-        print(f"✓ State search returned {len(bills)} bills")
-
-        # Test state normalization
-        state_abbr = tracker._normalize_state("California")
-        assert state_abbr == "CA", "_normalize_state should return state abbreviation"
-        print("✓ State normalization working")
-
-        return True
-    except Exception as e:
-        print(f"✗ BillTracker test failed: {e}")
-        return False
-
-def test_flask_app():
+    # Test keyword search
+    bills = tracker.search_bills_by_keyword("healthcare", limit=5)
+    assert isinstance(bills, list), "search_bills_by_keyword should return a list"
+
+    # Test state search
+    bills = tracker.search_bills_by_state("CA", limit=5)
+    assert isinstance(bills, list), "search_bills_by_state should return a list"
+
+    # Test state normalization
+    state_abbr = tracker._normalize_state("California")
+    assert state_abbr == "CA", "_normalize_state should return state abbreviation"
+
+def test_cached_get_refresh(fake_congress):
+    """Test that _cached_get serves repeats from cache and refresh=True bypasses it"""
+    tracker = fake_congress
+    fake_get = tracker.session.get
+    fake_get.respond = lambda url, params: (
+        (404, {}) if url.endswith('/missing') else (200, {'call': len(fake_get.calls)})
+    )
+    url = 'https://api.congress.gov/v3/bill/118/hr/1'
+    params = {'format': 'json'}
+
+    assert tracker._cached_get(url, params) == {'call': 1}
+    assert tracker._cached_get(url, params) == {'call': 1}, "Repeat GET should be served from cache"
+    assert tracker._cached_get(url, params, refresh=True) == {'call': 2}, "refresh=True should re-fetch"
+    assert tracker._cached_get(url, params) == {'call': 2}, "Refreshed response should replace the cached one"
+    assert len(fake_get.calls) == 2
+    assert tracker._cache_stats == {'hits': 2, 'misses': 2}
+
+    # Non-200 responses are returned as None and never cached
+    missing_url = 'https://api.congress.gov/v3/missing'
+    assert tracker._cached_get(missing_url, params) is None
+    assert tracker._cached_get(missing_url, params) is None
+    assert [call_url for call_url, _ in fake_get.calls].count(missing_url) == 2
+
+def test_congress_retry_policy(tracker):
+    """Test that Congress.gov retries skip read timeouts and hand the last 5xx back to _cached_get"""
+    retry = tracker.session.get_adapter('https://api.congress.gov').max_retries
+    assert retry.read == 0, "Read timeouts should not be retried"
+    assert retry.raise_on_status is False, "Exhausted 5xx retries should return the response, not raise"
+
+def test_keyword_search_filters_unmatched_bills(fake_congress):
+    """Test that keyword search drops bills matching neither title nor summary"""
+    tracker = fake_congress
+    tracker.api_key = 'test-key'
+
+    # The bill list endpoint returns the latest bills whatever the keyword
+    listed_bills = [
+        {'type': 'HR', 'number': '1', 'title': 'Unrelated Roads Act'},
+        {'type': 'S', 'number': '2', 'title': 'Farm Act', 'summary': 'Expands rural healthcare clinics'},
+        {'type': 'HR', 'number': '3', 'title': 'Healthcare Access Act'},
+    ]
+    tracker.session.get.respond = lambda url, params: (
+        (200, {'bills': listed_bills}) if url.endswith('/bill/118') else (404, {})
+    )
+
+    bills = tracker.search_bills_by_keyword('healthcare')
+    assert [bill['id'] for bill in bills] == ['HR3', 'S2'], "Title matches should come first, unmatched bills dropped"
+
+    # Every keyword is matched against the same cached page
+    bills = tracker.search_bills_by_keyword('Roads')
+    assert [bill['id'] for bill in bills] == ['HR1']
+    list_calls = [url for url, _ in tracker.session.get.calls if url.endswith('/bill/118')]
+    assert len(list_calls) == 1, "Searches with different keywords should share one cached bill list"
+
+@pytest.mark.parametrize('honours_state_code', [True, False])
+def test_members_by_state(fake_congress, honours_state_code):
+    """Test that state member lookups return the full delegation whether or not the API filters by state"""
+    tracker = fake_congress
+    # Congress.gov member records name the state in full
+    roster = [{'state': 'Texas', 'bioguideId': f'T{i}'} for i in range(70)]
+    roster += [{'state': 'California', 'bioguideId': f'C{i}'} for i in range(50)]
+
+    def respond(url, params):
+        members = roster
+        if honours_state_code and 'stateCode' in params:
+            members = [m for m in roster if tracker._normalize_state(m['state']) == params['stateCode']]
+        return 200, {'members': members[:params['limit']]}
+
+    tracker.session.get.respond = respond
+    members = tracker._get_members_by_state('CA')
+    # The fake serves the same roster for both chambers
+    assert len(members) == 100, f"Expected both chambers' CA members, got {len(members)}"
+    assert all(member['state'] == 'California' for member in members)
+    assert any('stateCode' not in params for _, params in tracker.session.get.calls) != honours_state_code, \
+        "Full roster should be fetched only when the state filter is ignored"
+
+def test_members_by_territory(fake_congress):
+    """Test that a filtered delegate lookup is trusted without fetching the full roster"""
+    tracker = fake_congress
+    tracker.session.get.respond = lambda url, params: (
+        200, {'members': [{'state': 'District of Columbia', 'bioguideId': 'N1'}] if 'house' in url else []}
+    )
+    members = tracker._get_members_by_state('DC')
+    assert [member['bioguideId'] for member in members] == ['N1']
+    assert all('stateCode' in params for _, params in tracker.session.get.calls), \
+        "A correctly filtered territory response should not trigger the roster fallback"
+
+def test_llm_summaries_batch(fake_hf):
+    """Test that batched AI summaries land on the right bills"""
+    from app import get_llm_summaries_batch
+    summaries = get_llm_summaries_batch(['alpha', 'No summary available', 'beta'], 'tax')
+    assert len(fake_hf.sent) == 1 and len(fake_hf.sent[0]) == 2, "Bills with text should share one request"
+    assert summaries[0] == 'AI: alpha'
+    assert summaries[1].startswith('Cannot generate AI summary'), "Bills without text should not be sent"
+    assert summaries[2] == 'AI: beta'
+
+    # A result that does not line up with the inputs falls back for every pending bill
+    fake_hf.result_count = 1
+    summaries = get_llm_summaries_batch(['gamma', 'delta'], 'tax')
+    assert all(summary.startswith('This bill addresses tax') for summary in summaries)
+
+def test_llm_summaries_batch_chunks(fake_hf, monkeypatch):
+    """Test that large batches are split into chunks whose results stay in order"""
+    import app as legiswatch
+    monkeypatch.setattr(legiswatch, 'LLM_BATCH_SIZE', 2)
+    texts = [f'bill{i}' for i in range(5)]
+    assert legiswatch.get_llm_summaries_batch(texts, 'tax') == [f'AI: {text}' for text in texts]
+    assert sorted(len(inputs) for inputs in fake_hf.sent) == [1, 2, 2]
+
+def test_llm_summary_cache(fake_hf):
+    """Test that cached AI summaries skip the HuggingFace request"""
+    from app import get_llm_summaries_batch
+    assert get_llm_summaries_batch(['alpha'], 'tax') == ['AI: alpha']
+    assert get_llm_summaries_batch(['alpha'], 'tax') == ['AI: alpha']
+    assert len(fake_hf.sent) == 1, "A cache hit should not call HuggingFace"
+
+    # Only the uncached bill is sent, and results still line up
+    assert get_llm_summaries_batch(['alpha', 'beta'], 'tax') == ['AI: alpha', 'AI: beta']
+    assert fake_hf.sent[-1] == [fake_hf.sent[0][0].replace('alpha', 'beta')]
+
+    # Fallback summaries are never cached
+    fake_hf.result_count = 0
+    get_llm_summaries_batch(['gamma'], 'tax')
+    get_llm_summaries_batch(['gamma'], 'tax')
+    assert len(fake_hf.sent) == 4
+
+def test_llm_summary_cache_db_errors(fake_hf, monkeypatch):
+    """Test that SQLite cache errors fall back to the API instead of failing the search"""
+    import sqlite3
+    import app as legiswatch
+    conn = sqlite3.connect(':memory:')
+    conn.close()  # Every query on a closed connection raises sqlite3.Error
+    monkeypatch.setattr(legiswatch, '_LLM_CACHE_CONN', conn)
+    assert legiswatch.get_llm_summaries_batch(['alpha'], 'tax') == ['AI: alpha']
+    assert len(fake_hf.sent) == 1
+
+def test_llm_cache_db_prunes_expired(tmp_path):
+    """Test that opening the AI summary store deletes expired rows"""
+    import time
+    from app import LLM_CACHE_TTL, _open_llm_cache_db
+    path = str(tmp_path / 'llm.db')
+    conn = _open_llm_cache_db(path)
+    conn.executemany('INSERT INTO llm_summaries (key, summary, created) VALUES (?, ?, ?)',
+                     [(b'old', 'stale', time.time() - LLM_CACHE_TTL - 1), (b'new', 'fresh', time.time())])
+    conn.commit()
+    conn.close()
+
+    conn = _open_llm_cache_db(path)
+    assert [row[0] for row in conn.execute('SELECT key FROM llm_summaries')] == [b'new']
+    conn.close()
+
+def test_flask_app(app, client):
     """Test Flask application routes"""
-    print("Testing Flask app...")
-    try:
-        from app import app
-        
-        with app.test_client() as client:
-            # Test main page
-            response = client.get('/')
-            assert response.status_code == 200, f"Main page returned {response.status_code}"
-            print("✓ Main page loads successfully")
-            
-            # Test health endpoint
-            response = client.get('/health')
-            assert response.status_code == 200, f"Health endpoint returned {response.status_code}"
-            print("✓ Health endpoint working")
-            
-            # Test search API
-            response = client.post('/api/search', 
-                                 json={'query': 'test', 'type': 'keyword', 'include_ai': False})
-            assert response.status_code == 200, f"Search API returned {response.status_code}"
-            print("✓ Search API working")
-            
-        return True
-    except Exception as e:
-        print(f"✗ Flask app test failed: {e}")
-        return False
-
-def test_server_startup():
-    """Test that the server can start successfully"""
-    print("Testing server startup...")
+    # Share one app context across the route checks
+    with app.app_context():
+        # Test main page
+        response = client.get('/')
+        assert response.status_code == 200, f"Main page returned {response.status_code}"
+
+        # Test health endpoint
+        response = client.get('/health')
+        assert response.status_code == 200, f"Health endpoint returned {response.status_code}"
+
+        # Test search API
+        response = client.post('/api/search',
+                               json={'query': 'test', 'type': 'keyword', 'include_ai': False})
+        assert response.status_code == 200, f"Search API returned {response.status_code}"
+
+        # Test CSV export
+        response = client.post('/api/export',
+                               json={'bills': [{'id': 'HR1', 'title': 'A "quoted", title'}]})
+        assert response.status_code == 200, f"Export API returned {response.status_code}"
+        rows = response.get_data(as_text=True).splitlines()
+        assert rows[0].startswith('Bill ID,Title,'), "Export should start with the header row"
+        assert rows[1].startswith('HR1,"A ""quoted"", title"'), "Export should quote CSV fields"
+
+        # Malformed bills are rejected before the CSV stream starts
+        for bills in (['x'], {'a': 1}):
+            response = client.post('/api/export', json={'bills': bills})
+            assert response.status_code == 400, f"Malformed export returned {response.status_code}"
+
+def test_server_startup(client):
+    """Test that the app serves its health check"""
+    response = client.get('/health')
+    assert response.status_code == 200, f"Server health check failed: {response.status_code}"
+
+@pytest.mark.skipif(os.environ.get('LEGISWATCH_LIVE_SERVER_TEST') != '1',
+                    reason="set LEGISWATCH_LIVE_SERVER_TEST=1 to run")
+def test_live_server_startup(app, http_session):
+    """Test the app behind a real WSGI server (set LEGISWATCH_LIVE_SERVER_TEST=1 to run)"""
+    import time
+    import requests
+    from werkzeug.serving import make_server
+
+    # Start server in a separate thread
+    server = make_server('127.0.0.1', 5001, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
     try:
-        from app import app
-        
-        # Start server in a separate thread
-        server = make_server('127.0.0.1', 5001, app, threaded=True)
-        server_thread = threading.Thread(target=server.serve_forever)
-        server_thread.daemon = True
-        server_thread.start()
-        
-        # Wait a moment for server to start
-        time.sleep(2)
-        
+        # Poll until the server answers instead of sleeping a fixed interval
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                if http_session.get('http://127.0.0.1:5001/health', timeout=0.2).ok:
+                    break
+            except requests.RequestException:
+                time.sleep(0.02)
+
         # Test if server responds
-        response = requests.get('http://127.0.0.1:5001/health', timeout=5)
+        response = http_session.get('http://127.0.0.1:5001/health', timeout=5)
         assert response.status_code == 200, f"Server health check failed: {response.status_code}"
-        
-        # Shutdown server
+    finally:
         server.shutdown()
-        
-        print("✓ Server startup and health check successful")
-        return True
-    except Exception as e:
-        print(f"✗ Server startup test failed: {e}")
-        return False
-
-def run_all_tests():
-    """Run all tests and report results"""
-    print("=" * 50)
-    print("LegisWatch Application Test Suite")
-    print("=" * 50)
-    
-    tests = [
-        ("Import Tests", test_imports),
-        ("BillTracker Tests", test_bill_tracker),
-        ("Flask App Tests", test_flask_app),
-        ("Server Startup Tests", test_server_startup)
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n{test_name}:")
-        print("-" * 30)
-        if test_func():
-            passed += 1
-        else:
-            print("Test failed!")
-    
-    print("\n" + "=" * 50)
-    print(f"Test Results: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("🎉 All tests passed! LegisWatch is ready to run.")
-        print("\nTo start the application, run:")
-        print("python app.py")
-    else:
-        print("❌ Some tests failed. Please check the errors above.")
-        print("\nCommon issues:")
-        print("- Missing dependencies (run: pip install -r requirements.txt)")
-        print("- Python version compatibility (requires Python 3.8+)")
-        
-    return passed == total
 
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__]))